@@ -8,11 +8,38 @@ Supports rendering all patterns in the patterns folder.
 import json
 import sys
 import os
-import subprocess
+import asyncio
 import argparse
+import shutil
+import hashlib
+import multiprocessing
 from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
 from PIL import Image
-from collections import Counter
+from render_parallel import blender_command, shard_calls
+
+# Printed by render_rashguard.py after each file is written (keep in sync)
+RENDER_WRITTEN_MARKER = 'RENDER_WRITTEN:'
+
+# Printed by render_rashguard_server.py after each job (keep in sync)
+JOB_DONE_MARKER = 'JOB_DONE'
+JOB_FAILED_MARKER = 'JOB_FAILED'
+
+# Pattern part of output filenames, same translation as _SAFE_TBL in render_rashguard.py (keep in sync)
+SAFE_PATTERN_TBL = str.maketrans({' ': '_', '.': '_', '(': '', ')': ''})
+
+# Every N-th pixel (in x and y) of the thread color sample region is counted
+COLOR_SAMPLE_STRIDE = 4
+# Below this many opaque strided samples the full region is counted instead
+MIN_COLOR_SAMPLES = 8
+
+# Map engine names
+ENGINE_MAP = {
+    'CYCLES': 'CYCLES',
+    'EEVEE': 'BLENDER_EEVEE_NEXT'
+}
 
 def extract_thread_color_from_pattern(pattern_path):
     """
@@ -20,9 +47,8 @@ def extract_thread_color_from_pattern(pattern_path):
     Returns hex color string (e.g., "#0283EC").
     """
     pil_image = Image.open(pattern_path)
-    pil_image = pil_image.convert("RGBA")  # Ensure RGBA format
     
-    # Get image dimensions
+    # Get image dimensions (read from the header, nothing decoded yet)
     width, height = pil_image.size
     
     # Sample region: top-right area with margin
@@ -32,36 +58,298 @@ def extract_thread_color_from_pattern(pattern_path):
     start_x = max(0, int(width * 0.9))
     start_y = max(0, int(height * 0.05))  # 5% down from top
     
-    # Collect colors from the region
-    colors = []
-    
-    for sy in range(sample_height):
-        for sx in range(sample_width):
-            x = start_x + sx
-            y = start_y + sy
-            
-            # Get pixel color
-            pixel = pil_image.getpixel((x, y))
-            r, g, b, a = pixel[0], pixel[1], pixel[2], pixel[3]
-            
-            # Skip transparent pixels
-            if a > 200:
-                colors.append((r, g, b))
+    # Only convert the sampled region to RGBA, not the whole image
+    box = (start_x, start_y, start_x + sample_width, start_y + sample_height)
+    with pil_image:
+        region = np.asarray(pil_image.crop(box).convert("RGBA"))
+    
+    # Skip transparent pixels, counting a strided grid is enough for a solid corner
+    sparse = region[::COLOR_SAMPLE_STRIDE, ::COLOR_SAMPLE_STRIDE]
+    opaque = sparse[..., :3][sparse[..., 3] > 200]
+    if len(opaque) < MIN_COLOR_SAMPLES:
+        opaque = region[..., :3][region[..., 3] > 200]
     
     # Use most common color from region
-    if colors:
-        most_common = Counter(colors).most_common(1)[0][0]
-        hex_color = f"#{most_common[0]:02X}{most_common[1]:02X}{most_common[2]:02X}"
+    if len(opaque):
+        # Pack RGB into one integer per pixel so colors can be counted in a single pass
+        packed = opaque.astype(np.uint32)
+        keys = (packed[:, 0] << 16) | (packed[:, 1] << 8) | packed[:, 2]
+        if (keys == keys[0]).all():
+            # Solid corner (the usual case): no need to sort and count
+            dominant = keys[0]
+        else:
+            values, counts = np.unique(keys, return_counts=True)
+            dominant = values[counts.argmax()]
+        hex_color = f"#{int(dominant):06X}"
     else:
-        # Fallback to single pixel slightly offset from corner
-        x = min(width - 1, start_x)
-        y = start_y
-        pixel = pil_image.getpixel((x, y))
-        r, g, b = pixel[0], pixel[1], pixel[2]
+        # Fallback to single pixel slightly offset from corner (top-left of the region)
+        r, g, b = region[0, 0, :3]
         hex_color = f"#{r:02X}{g:02X}{b:02X}"
     
     return hex_color
 
+def list_patterns(patterns_dir):
+    """Sorted PNG filenames in patterns_dir, from a single directory scan."""
+    with os.scandir(patterns_dir) as entries:
+        return sorted(
+            entry.name for entry in entries
+            if entry.name.lower().endswith('.png') and entry.is_file(follow_symlinks=False)
+        )
+
+def group_duplicate_patterns(patterns_dir, pattern_names):
+    """
+    Group byte-identical pattern files by content hash.
+    Returns {first pattern: [identical patterns after it]} in the original order.
+    """
+    groups = {}
+    for pattern_name in pattern_names:
+        digest = hashlib.blake2b((patterns_dir / pattern_name).read_bytes(), digest_size=16).hexdigest()
+        groups.setdefault(digest, []).append(pattern_name)
+    return {names[0]: names[1:] for names in groups.values()}
+
+def copy_duplicate_outputs(pattern_name, output_paths, duplicates):
+    """Copy the renders of pattern_name to the output names of its identical duplicates."""
+    prefix = os.path.splitext(pattern_name)[0].translate(SAFE_PATTERN_TBL) + '_'
+    for output_path in output_paths:
+        folder, filename = os.path.split(output_path)
+        # Camera renders (no presets) aren't named after the pattern, nothing to copy
+        if not filename.startswith(prefix):
+            continue
+        for duplicate in duplicates:
+            duplicate_prefix = os.path.splitext(duplicate)[0].translate(SAFE_PATTERN_TBL) + '_'
+            shutil.copyfile(output_path, os.path.join(folder, duplicate_prefix + filename[len(prefix):]))
+
+def load_color_cache(cache_path):
+    """Load cached thread colors ({pattern path: {mtime_ns, size, color}}). Missing or broken cache -> empty."""
+    try:
+        with open(cache_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_color_cache(cache_path, cache):
+    """Save cached thread colors to JSON file."""
+    with open(cache_path, 'w') as f:
+        json.dump(cache, f, indent=2)
+
+def get_thread_color(pattern_path, cache=None):
+    """
+    Thread color for a pattern, reusing the cached value while the file is unchanged
+    (same mtime and size). Misses are extracted and stored in the cache.
+    """
+    if cache is None:
+        return extract_thread_color_from_pattern(str(pattern_path))
+    
+    st = os.stat(pattern_path)
+    key = str(pattern_path)
+    entry = cache.get(key)
+    if entry and entry.get('mtime_ns') == st.st_mtime_ns and entry.get('size') == st.st_size:
+        return entry['color']
+    
+    color = extract_thread_color_from_pattern(key)
+    cache[key] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'color': color}
+    return color
+
+def convert_to_png(src_path, png_path):
+    """Encode a staged (uncompressed) render as the final PNG and delete the staged file."""
+    with Image.open(src_path) as img:
+        img.convert("RGBA").save(png_path, optimize=False, compress_level=1)
+    os.remove(src_path)
+    return png_path
+
+def echo_blender_line(line, on_written=None, tag=None):
+    """Print one line of Blender output (prefixed with [tag]) and report written render files."""
+    print(f"[{tag}] {line}" if tag else line, end='', flush=True)
+    if on_written and line.startswith(RENDER_WRITTEN_MARKER):
+        on_written(line[len(RENDER_WRITTEN_MARKER):].strip())
+
+async def gather_or_cancel(*aws):
+    """
+    asyncio.gather that, when one awaitable fails, cancels the others and waits for them
+    before re-raising, so nothing is left reading a Blender pipe in the background.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+async def run_blender(cmd, env, on_written=None, tag=None):
+    """
+    Run Blender without blocking the event loop and echo its output line by line,
+    prefixed with [tag] so parallel runs stay readable.
+    Calls on_written(path) for every render file Blender reports as written.
+    Returns the exit code.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        env=env,
+        cwd=os.getcwd(),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT
+    )
+    try:
+        while True:
+            line = await proc.stdout.readline()
+            if not line:
+                break
+            echo_blender_line(line.decode('utf-8', errors='replace'), on_written, tag)
+    except BaseException:
+        # Cancelled or failed while reporting output: don't leave Blender rendering on its own
+        if proc.returncode is None:
+            proc.kill()
+        await proc.wait()
+        raise
+    return await proc.wait()
+
+async def run_shards(calls, on_written=None, tag=None):
+    """Run all GPU shards concurrently. Returns 0 if every shard succeeded, else the first failing exit code."""
+    return_codes = await gather_or_cancel(*(
+        run_blender(cmd, env, on_written, tag=f"{tag} GPU {i}" if tag else f"GPU {i}")
+        for i, (cmd, env) in enumerate(calls)
+    ))
+    return next((code for code in return_codes if code != 0), 0)
+
+async def start_servers(server_cmd, num_gpus, env):
+    """
+    Start one long-lived Blender render server (render_rashguard_server.py) per GPU.
+    The group renders one pattern at a time, split across its GPUs like --gpus.
+    """
+    calls = shard_calls(server_cmd, num_gpus, env) if num_gpus > 1 else [(server_cmd, env)]
+    return [
+        await asyncio.create_subprocess_exec(
+            *cmd,
+            env=shard_env,
+            cwd=os.getcwd(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT
+        )
+        for cmd, shard_env in calls
+    ]
+
+async def server_render(proc, params, on_written=None, tag=None):
+    """
+    Send one job to a render server and echo its output until the job is answered.
+    Returns 0 on success, 1 if the job failed, or the exit code if the server died.
+    """
+    try:
+        proc.stdin.write(json.dumps(params).encode('utf-8') + b'\n')
+        await proc.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        return await proc.wait() or 1
+    
+    while True:
+        line = await proc.stdout.readline()
+        if not line:
+            return await proc.wait() or 1
+        line = line.decode('utf-8', errors='replace')
+        if line.strip() == JOB_DONE_MARKER:
+            return 0
+        if line.strip() == JOB_FAILED_MARKER:
+            return 1
+        echo_blender_line(line, on_written, tag)
+
+async def stop_server(proc, tag=None):
+    """Close a render server's job queue and echo its remaining output until it exits."""
+    if proc.returncode is None:
+        proc.stdin.close()
+    while True:
+        line = await proc.stdout.readline()
+        if not line:
+            break
+        echo_blender_line(line.decode('utf-8', errors='replace'), tag=tag)
+    return await proc.wait()
+
+async def kill_server(proc):
+    """Kill a render server whose job did not complete, its output can't be trusted to line up."""
+    if proc.returncode is None:
+        proc.kill()
+    return await proc.wait()
+
+def shared_render_params(config, jobs=1):
+    """RENDER_PARAMS entries that are the same for every pattern, computed once per run."""
+    num_gpus = max(1, int(config.get('gpus', 1)))
+    return {
+        'engine': ENGINE_MAP.get(config['engine'], 'CYCLES'),
+        'samples': config['samples'],
+        'resolution_scale': config['resolution_scale'],
+        'output_width': config.get('output_width', 480),
+        'output_height': config.get('output_height', 480),
+        'presets': config.get('presets', []),
+        'cameras': config.get('cameras', []),
+        'output_dir': Path(config['output_dir']).resolve().as_posix(),
+        # The CPU only joins the GPU as an extra Cycles device when Blender runs alone,
+        # several processes each using every core would slow the GPUs down
+        'hybrid_cpu': num_gpus == 1 and jobs == 1,
+    }
+
+async def render_one(pattern_name, config, base_cmd, base_env, base_params, on_written=None, color_future=None, servers=None):
+    """
+    Render a single pattern: extract its thread color and run base_cmd (see blender_command()).
+    Parameters go to Blender as JSON in RENDER_PARAMS, so concurrent runs never share a file.
+    With servers (see start_servers()) the same parameters are sent as a job instead.
+    color_future is a prefetched get_thread_color() result, extracted here if not given.
+    Returns the Blender exit code (first failing shard when split across GPUs).
+    """
+    print("=" * 60)
+    print(f"RENDERING: {pattern_name}")
+    print("=" * 60)
+    
+    num_gpus = max(1, int(config.get('gpus', 1)))
+    
+    # Extract thread color from pattern using PIL (usually already done on a prefetch thread)
+    if color_future is not None:
+        thread_color = await asyncio.wrap_future(color_future)
+    else:
+        thread_color = get_thread_color(Path('patterns') / pattern_name)
+    print(f"  Extracted thread color: {thread_color}")
+    
+    # Remove file extension for cleaner output names
+    pattern_base = os.path.splitext(pattern_name)[0]
+    staging_dir = f"{base_params['output_dir']}/.staging/{pattern_base}" if config.get('deferred_png') else ''
+    
+    # Only the pattern-specific entries are added here
+    params = {
+        **base_params,
+        'pattern': pattern_name,
+        'pattern_base': pattern_base,
+        'threads_color': thread_color,
+        'staging_dir': staging_dir,
+    }
+    
+    # Print pattern info
+    print(f"Pattern:         {pattern_name}")
+    print(f"Samples:         {config['samples']}")
+    print(f"Engine:          {config['engine']}")
+    print(f"Resolution:      {config['resolution_scale']}%")
+    print(f"Output Size:     {config.get('output_width', 480)}x{config.get('output_height', 480)}px")
+    print(f"Output Dir:      {config['output_dir']}")
+    print(f"GPUs:            {num_gpus}")
+    print()
+    
+    # Run Blender for this pattern
+    print(f"Starting Blender render...")
+    print()
+    
+    if servers:
+        # Blender is already running with the scene loaded, one job per GPU
+        return_codes = await gather_or_cancel(*(
+            server_render(proc, params, on_written, tag=f"{pattern_name} GPU {i}" if len(servers) > 1 else pattern_name)
+            for i, proc in enumerate(servers)
+        ))
+        return next((code for code in return_codes if code != 0), 0)
+    
+    env = {**base_env, 'RENDER_PARAMS': json.dumps(params)}
+    
+    if num_gpus > 1:
+        # One Blender process per GPU, each rendering its share of presets/cameras
+        return await run_shards(shard_calls(base_cmd, num_gpus, env), on_written, tag=pattern_name)
+    return await run_blender(base_cmd, env, on_written=on_written, tag=pattern_name)
+
 def load_config(config_path):
     """Load configuration from JSON file."""
     with open(config_path, 'r') as f:
@@ -83,6 +371,9 @@ Examples:
   python render_cli.py --color "#FF0000"        # Set thread color (red)
   python render_cli.py --preset "Camera.001" 180 "Camera.002" 240  # Multiple presets
   python render_cli.py --cameras "Camera1" "Camera2"  # Select cameras
+  python render_cli.py --gpus 2                 # Split each render across 2 GPUs
+  python render_cli.py --jobs 3                 # Render 3 patterns at a time
+  python render_cli.py --server                 # Keep Blender running between patterns
         '''
     )
     
@@ -96,54 +387,25 @@ Examples:
     parser.add_argument('--preset', nargs='+', metavar='ARGS', help='Render presets: pairs of camera name and frame (e.g., "Camera.001" 180 "Camera.002" 240)')
     parser.add_argument('--cameras', nargs='+', help='Camera names to render')
     parser.add_argument('--output', help='Output directory')
+    parser.add_argument('--gpus', type=int, help='Number of GPUs to split each render across (one Blender process per GPU)')
+    parser.add_argument('--jobs', type=int, help='Number of patterns to render in parallel (0 = one per CPU, default: 1)')
+    parser.add_argument('--server', action='store_true', help='Keep one Blender process (per job) running and send it each pattern, instead of starting Blender per pattern')
+    parser.add_argument('--deferred-png', action='store_true', help='Render to uncompressed TIFF and encode PNGs in parallel while the next pattern renders')
     parser.add_argument('--list-cameras', action='store_true', help='List available cameras and exit')
     parser.add_argument('--list-patterns', action='store_true', help='List available patterns and exit')
     
     args = parser.parse_args()
     
-    # Load base config
-    if not os.path.exists(args.config):
-        print(f"Error: Config file '{args.config}' not found")
-        sys.exit(1)
-    
-    config = load_config(args.config)
-    
-    # Override with command-line arguments
-    if args.samples:
-        config['samples'] = args.samples
-    if args.engine:
-        config['engine'] = args.engine
-    if args.resolution:
-        config['resolution_scale'] = args.resolution
-    if args.width:
-        config['output_width'] = args.width
-    if args.height:
-        config['output_height'] = args.height
-    if args.threads_color:
-        config['threads_color'] = args.threads_color
-    if args.preset:
-        # Parse preset pairs: ["camera1", "180", "camera2", "240"] -> [["camera1", 180], ["camera2", 240]]
-        presets = []
-        for i in range(0, len(args.preset), 2):
-            if i + 1 < len(args.preset):
-                camera_name = args.preset[i]
-                frame_num = int(args.preset[i + 1])
-                presets.append([camera_name, frame_num])
-        config['presets'] = presets
-    if args.cameras:
-        config['cameras'] = args.cameras
-    if args.output:
-        config['output_dir'] = args.output
-    
+    # --list-* only need the patterns folder, answer them before touching the config
     patterns_dir = Path('patterns')
+    patterns_to_render = list_patterns(patterns_dir) if patterns_dir.is_dir() else None
     
     # Handle --list-patterns
     if args.list_patterns:
-        if patterns_dir.exists():
-            patterns = sorted([f.name for f in patterns_dir.glob('*.png')])
-            if patterns:
+        if patterns_to_render is not None:
+            if patterns_to_render:
                 print("Available patterns:")
-                for p in patterns:
+                for p in patterns_to_render:
                     print(f"  - {p}")
             else:
                 print("No patterns found")
@@ -155,198 +417,6 @@ Examples:
         print("To see available cameras, render with verbose output")
         return
     
-    # Always render all patterns in patterns folder
-    if patterns_dir.exists():
-        patterns_to_render = sorted([f.name for f in patterns_dir.glob('*.png')])
-        if not patterns_to_render:
-            print(f"Error: No PNG files found in {patterns_dir}/")
-            sys.exit(1)
-    else:
-        print(f"Error: Patterns directory not found: {patterns_dir}/")
-        sys.exit(1)
-    
-    # Validate patterns exist
-    for pattern_name in patterns_to_render:
-        pattern_path = patterns_dir / pattern_name
-        if not pattern_path.exists():
-            print(f"Error: Pattern not found: {pattern_path}")
-            sys.exit(1)
-    
-    print("=" * 60)
-    print("RASHGUARD RENDER AUTOMATION - CLI")
-    print("=" * 60)
-    print(f"Will render {len(patterns_to_render)} pattern(s):")
-    for p in patterns_to_render:
-        print(f"  - {p}")
-    print()
-    
-    # Map engine names
-    engine_map = {
-        'CYCLES': 'CYCLES',
-        'EEVEE': 'BLENDER_EEVEE_NEXT'
-    }
-    blender_engine = engine_map.get(config['engine'], 'CYCLES')
-    
-    # Find Blender executable
-    blender_paths = [
-        Path('C:/Program Files/Blender Foundation/Blender 4.5/blender.exe'),
-        Path('/Applications/Blender.app/Contents/MacOS/Blender'),
-        Path('/usr/bin/blender'),
-        Path('/snap/bin/blender'),
-    ]
-    
-    blender_exe = None
-    for path in blender_paths:
-        if path.exists():
-            blender_exe = path
-            break
-    
-    if not blender_exe:
-        print("Error: Blender executable not found. Please install Blender.")
-        sys.exit(1)
-    
-    # Get blend file
-    blend_file = Path(config['blend_file'])
-    if not blend_file.exists():
-        print(f"Error: Blend file not found: {blend_file}")
-        sys.exit(1)
-    
-    # Render each pattern
-    render_script_path = Path('render_rashguard.py')
-    original_script_content = None
-    temp_script = Path('.render_temp.py')
-    
-    try:
-        for pattern_name in patterns_to_render:
-            print("=" * 60)
-            print(f"RENDERING: {pattern_name}")
-            print("=" * 60)
-            
-            # Load original script content once
-            if original_script_content is None:
-                with open(render_script_path, 'r', encoding='utf-8') as f:
-                    original_script_content = f.read()
-            
-            script_content = original_script_content
-            
-            # Replace placeholders for this pattern
-            cameras_str = repr(tuple(config.get('cameras', [])))
-            
-            # Extract thread color from pattern using PIL
-            pattern_path = patterns_dir / pattern_name
-            thread_color = extract_thread_color_from_pattern(str(pattern_path))
-            print(f"  Extracted thread color: {thread_color}")
-            
-            presets = config.get('presets', [])
-            presets_str = repr(presets)
-            
-            # Remove file extension for cleaner output names
-            pattern_base = os.path.splitext(pattern_name)[0]
-            script_content = script_content.replace('__PATTERN_PLACEHOLDER__', pattern_name)
-            script_content = script_content.replace('__PATTERN_BASE_PLACEHOLDER__', pattern_base)
-            script_content = script_content.replace('__ENGINE_PLACEHOLDER__', blender_engine)
-            script_content = script_content.replace('__SAMPLES_PLACEHOLDER__', str(config['samples']))
-            script_content = script_content.replace('__SCALE_PLACEHOLDER__', str(config['resolution_scale']))
-            script_content = script_content.replace('__OUTPUT_WIDTH_PLACEHOLDER__', str(config.get('output_width', 480)))
-            script_content = script_content.replace('__OUTPUT_HEIGHT_PLACEHOLDER__', str(config.get('output_height', 480)))
-            script_content = script_content.replace('__PRESETS_PLACEHOLDER__', presets_str)
-            script_content = script_content.replace('__CAMERAS_PLACEHOLDER__', cameras_str)
-            script_content = script_content.replace('__THREADS_COLOR_PLACEHOLDER__', thread_color)
-            
-            # Write temp script
-            with open(temp_script, 'w', encoding='utf-8') as f:
-                f.write(script_content)
-            
-            # Print pattern info
-            print(f"Pattern:         {pattern_name}")
-            print(f"Samples:         {config['samples']}")
-            print(f"Engine:          {config['engine']}")
-            print(f"Resolution:      {config['resolution_scale']}%")
-            print(f"Output Size:     {config.get('output_width', 480)}x{config.get('output_height', 480)}px")
-            print(f"Output Dir:      {config['output_dir']}")
-            print()
-            
-            # Run Blender for this pattern
-            print(f"Starting Blender render...")
-            print()
-            
-            env = os.environ.copy()
-            env['PYTHONUNBUFFERED'] = '1'
-            
-            result = subprocess.run(
-                [str(blender_exe), str(blend_file), '--background', '--python', str(temp_script)],
-                env=env,
-                cwd=os.getcwd()
-            )
-            
-            if result.returncode == 0:
-                print()
-                print(f"✓ {pattern_name} render complete!")
-                print()
-            else:
-                print()
-                print(f"✗ {pattern_name} render failed")
-                print()
-    
-    finally:
-        # Clean up temp script
-        if temp_script.exists():
-            temp_script.unlink()
-        
-        # Restore placeholders in original script
-        if original_script_content:
-            with open(render_script_path, 'w', encoding='utf-8') as f:
-                f.write(original_script_content)
-    
-    print("=" * 60)
-    print(f"✓ ALL {len(patterns_to_render)} PATTERNS RENDERED!")
-    print("=" * 60)
-    print(f"Output saved to: {config['output_dir']}/")
-
-if __name__ == '__main__':
-    main()
-
-def load_config(config_path):
-    """Load configuration from JSON file."""
-    with open(config_path, 'r') as f:
-        return json.load(f)
-
-def save_config(config_path, config):
-    """Save configuration to JSON file."""
-    with open(config_path, 'w') as f:
-        json.dump(config, f, indent=2)
-
-def main():
-    parser = argparse.ArgumentParser(
-        description='Rashguard Render Automation - CLI Version',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog='''
-Examples:
-  python render_cli.py                          # Use config.json
-  python render_cli.py --config myconfig.json   # Use custom config
-  python render_cli.py --pattern mypattern.png  # Override pattern
-  python render_cli.py --color "#FF0000"        # Set thread color (red)
-  python render_cli.py --preset "Camera.001" 180 "Camera.002" 240  # Multiple presets
-  python render_cli.py --cameras "Camera1" "Camera2"  # Select cameras
-        '''
-    )
-    
-    parser.add_argument('--config', default='config.json', help='Config file path (default: config.json)')
-    parser.add_argument('--pattern', help='Pattern image filename')
-    parser.add_argument('--samples', type=int, help='Render samples (8-256)')
-    parser.add_argument('--engine', choices=['CYCLES', 'EEVEE'], help='Render engine')
-    parser.add_argument('--resolution', type=int, choices=[50, 75, 100], help='Resolution scale (%)')
-    parser.add_argument('--width', type=int, help='Output image width (pixels)')
-    parser.add_argument('--height', type=int, help='Output image height (pixels)')
-    parser.add_argument('--color', '--threads-color', dest='threads_color', help='Thread color (hex: #RRGGBB)')
-    parser.add_argument('--preset', nargs='+', metavar='ARGS', help='Render presets: pairs of camera name and frame (e.g., "Camera.001" 180 "Camera.002" 240)')
-    parser.add_argument('--cameras', nargs='+', help='Camera names to render')
-    parser.add_argument('--output', help='Output directory')
-    parser.add_argument('--list-cameras', action='store_true', help='List available cameras and exit')
-    parser.add_argument('--list-patterns', action='store_true', help='List available patterns and exit')
-    
-    args = parser.parse_args()
-    
     # Load base config
     if not os.path.exists(args.config):
         print(f"Error: Config file '{args.config}' not found")
@@ -372,65 +442,44 @@ Examples:
         presets = []
         for i in range(0, len(args.preset), 2):
             if i + 1 < len(args.preset):
-                try:
-                    presets.append([args.preset[i], int(args.preset[i+1])])
-                except ValueError:
-                    print(f"Error: Frame must be a number, got '{args.preset[i+1]}'")
-                    sys.exit(1)
-        if presets:
-            config['presets'] = presets
+                camera_name = args.preset[i]
+                frame_num = int(args.preset[i + 1])
+                presets.append([camera_name, frame_num])
+        config['presets'] = presets
     if args.cameras:
         config['cameras'] = args.cameras
     if args.output:
         config['output_dir'] = args.output
+    if args.gpus:
+        config['gpus'] = args.gpus
+    if args.jobs is not None:
+        config['jobs'] = args.jobs
+    if args.server:
+        config['server'] = True
+    if args.deferred_png:
+        config['deferred_png'] = True
     
-    # Handle list commands
-    if args.list_patterns:
-        patterns_dir = Path('patterns')
-        if patterns_dir.exists():
-            patterns = sorted([f.name for f in patterns_dir.glob('*') if f.is_file()])
-            print("Available patterns:")
-            for p in patterns:
-                print(f"  - {p}")
-        else:
-            print("Patterns directory not found")
-        return
-    
-    if args.list_cameras:
-        # Would need to open Blender and query scenes - for now show message
-        print("To see available cameras, render with verbose output")
-        return
-    
-    # Validate config
-    if not config.get('pattern'):
-        print("Error: No pattern specified. Use --pattern or set in config.json")
-        sys.exit(1)
-    
-    patterns_dir = Path('patterns')
-    
-    # Render all patterns in the folder
-    patterns_to_render = []
-    # Get all PNG files from patterns folder
-    if patterns_dir.exists():
-        patterns_to_render = sorted([f.name for f in patterns_dir.glob('*.png')])
-        if not patterns_to_render:
-            print(f"Error: No PNG files found in {patterns_dir}/")
-            sys.exit(1)
-    else:
+    # Always render all patterns in patterns folder
+    if patterns_to_render is None:
         print(f"Error: Patterns directory not found: {patterns_dir}/")
         sys.exit(1)
+    if not patterns_to_render:
+        print(f"Error: No PNG files found in {patterns_dir}/")
+        sys.exit(1)
     
+    print("=" * 60)
+    print("RASHGUARD RENDER AUTOMATION - CLI")
+    print("=" * 60)
     print(f"Will render {len(patterns_to_render)} pattern(s):")
     for p in patterns_to_render:
         print(f"  - {p}")
     print()
     
-    # Map engine names
-    engine_map = {
-        'CYCLES': 'CYCLES',
-        'EEVEE': 'BLENDER_EEVEE_NEXT'
-    }
-    blender_engine = engine_map.get(config['engine'], 'CYCLES')
+    # Byte-identical patterns are rendered once, the others get copies of the output
+    duplicates = group_duplicate_patterns(patterns_dir, patterns_to_render)
+    for pattern_name, copies in duplicates.items():
+        for duplicate in copies:
+            print(f"  {duplicate} is identical to {pattern_name}, copying its renders")
     
     # Find Blender executable
     blender_paths = [
@@ -456,132 +505,146 @@ Examples:
         print(f"Error: Blend file not found: {blend_file}")
         sys.exit(1)
     
-    # Render each pattern
-    render_script_path = Path('render_rashguard.py')
-    original_script_content = None
-    
-    for pattern_name in patterns_to_render:
-        print("=" * 60)
-        print(f"RENDERING: {pattern_name}")
-        print("=" * 60)
-    
-    # Replace placeholders
-    cameras_str = repr(tuple(config.get('cameras', [])))
-    color_replacement = config.get('threads_color', '')  # No extra quotes - placeholder is already in quotes
-    presets = config.get('presets', [])
-    presets_str = repr(presets)
-    
-    script_content = script_content.replace('__PATTERN_PLACEHOLDER__', config['pattern'])
-    script_content = script_content.replace('__ENGINE_PLACEHOLDER__', blender_engine)
-    script_content = script_content.replace('__SAMPLES_PLACEHOLDER__', str(config['samples']))
-    script_content = script_content.replace('__SCALE_PLACEHOLDER__', str(config['resolution_scale']))
-    script_content = script_content.replace('__OUTPUT_WIDTH_PLACEHOLDER__', str(config.get('output_width', 480)))
-    script_content = script_content.replace('__OUTPUT_HEIGHT_PLACEHOLDER__', str(config.get('output_height', 480)))
-    script_content = script_content.replace('__PRESETS_PLACEHOLDER__', presets_str)
-    script_content = script_content.replace('__CAMERAS_PLACEHOLDER__', cameras_str)
-    script_content = script_content.replace('__THREADS_COLOR_PLACEHOLDER__', color_replacement)
-    
-    # Write temp script
-    temp_script = Path('.render_temp.py')
-    with open(temp_script, 'w', encoding='utf-8') as f:
-        f.write(script_content)
-    
-    # Print configuration
-    print("=" * 60)
-    print("RASHGUARD RENDER AUTOMATION - CLI")
-    print("=" * 60)
-    print(f"Pattern:         {config['pattern']}")
-    print(f"Samples:         {config['samples']}")
-    print(f"Engine:          {config['engine']}")
-    print(f"Resolution:      {config['resolution_scale']}%")
-    print(f"Output Size:     {config.get('output_width', 480)}x{config.get('output_height', 480)}px")
-    print(f"Thread Color:    {config.get('threads_color', 'white (default)')}")
-    if config.get('presets'):
-        print(f"Mode:            PRESET (multi renders)")
-        for i, (camera, frame) in enumerate(config['presets'], 1):
-            print(f"  Preset {i}:      {camera} @ frame {frame}")
-    else:
-        print(f"Mode:            MULTI (all cameras)")
-        if config.get('cameras'):
-            print(f"Cameras:         {', '.join(config['cameras'])}")
+    # Thread colors from previous runs, stored next to the config file
+    color_cache_path = Path(args.config).parent / '.thread_color_cache.json'
+    color_cache = load_color_cache(color_cache_path)
+    
+    # Deferred PNG: Blender writes TIFFs to a staging folder, PNG encoding runs in worker processes
+    output_dir = Path(config['output_dir'])
+    staging_root = output_dir / '.staging'
+    # Spawned (not forked) workers, so they don't inherit render server stdin pipes and keep servers alive
+    converter = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) if config.get('deferred_png') else None
+    conversions = []
+    submitted = set()
+    
+    # Final output files per pattern, for copying to duplicates
+    written = defaultdict(list)
+    
+    def submit_conversion(staged_path):
+        """Queue one staged render for PNG encoding (once). Returns the PNG path, None if already queued."""
+        staged_path = os.path.normcase(os.path.realpath(staged_path))
+        if staged_path in submitted:
+            return None
+        submitted.add(staged_path)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        png_path = output_dir / f"{Path(staged_path).stem}.png"
+        conversions.append(converter.submit(convert_to_png, staged_path, str(png_path)))
+        return str(png_path)
+    
+    def record_written(pattern_name, path):
+        """Blender finished a file: start its PNG encoding (deferred mode) and remember the output."""
+        if converter:
+            path = submit_conversion(path)
+        if path:
+            written[pattern_name].append(path)
+    
+    # Same command and base environment for every pattern, only RENDER_PARAMS changes
+    render_script = Path(__file__).resolve().parent / 'render_rashguard.py'
+    base_cmd = blender_command(blender_exe, blend_file, render_script)
+    base_env = os.environ.copy()
+    base_env['PYTHONUNBUFFERED'] = '1'
+    server_cmd = blender_command(blender_exe, blend_file, render_script.with_name('render_rashguard_server.py'))
+    
+    # --jobs 0 means one job per pattern, up to the number of CPUs
+    jobs = int(config.get('jobs', 1))
+    if jobs <= 0:
+        jobs = min(len(duplicates), os.cpu_count() or 1)
+    base_params = shared_render_params(config, min(jobs, len(duplicates)))
+    
+    def finish_pattern(pattern_name, returncode):
+        """Report a finished pattern and queue any staged renders it left behind."""
+        if returncode == 0:
+            print()
+            print(f"✓ {pattern_name} render complete!")
+            print()
         else:
-            print(f"Cameras:         All")
-    print(f"Output Dir:      {config['output_dir']}")
-    print("=" * 60)
-    print()
-    
-    # Find Blender executable
-    blender_paths = [
-        Path('C:/Program Files/Blender Foundation/Blender 4.5/blender.exe'),
-        Path('/Applications/Blender.app/Contents/MacOS/Blender'),
-        Path('/usr/bin/blender'),
-        Path('/snap/bin/blender'),
-    ]
-    
-    blender_exe = None
-    for path in blender_paths:
-        if path.exists():
-            blender_exe = path
-            break
-    
-    if not blender_exe:
-        print("Error: Blender executable not found. Please install Blender.")
-        sys.exit(1)
+            print()
+            print(f"✗ {pattern_name} render failed")
+            print()
+        
+        # Pick up anything not reported while rendering (e.g. a crashed Blender)
+        staging_dir = staging_root / os.path.splitext(pattern_name)[0]
+        if converter and staging_dir.exists():
+            for staged in staging_dir.iterdir():
+                record_written(pattern_name, str(staged))
+    
+    async def render_patterns():
+        """Run up to `jobs` Blender processes at once; Blender startup/scene load overlaps with other renders."""
+        semaphore = asyncio.Semaphore(jobs)
+        
+        # Server mode: one idle server group per job, Blender starts and loads the scene only once per group
+        idle_servers = []
+        retired_servers = []
+        if config.get('server'):
+            num_gpus = max(1, int(config.get('gpus', 1)))
+            for _ in range(min(jobs, len(duplicates))):
+                idle_servers.append(await start_servers(server_cmd, num_gpus, base_env))
+        
+        async def render_bounded(pattern_name):
+            async with semaphore:
+                # No idle group left (all retired): fall back to one Blender run per pattern
+                servers = idle_servers.pop() if idle_servers else None
+                completed = False
+                try:
+                    # Deferred frames start encoding as soon as Blender reports them written
+                    returncode = await render_one(
+                        pattern_name, config, base_cmd, base_env, base_params,
+                        on_written=lambda path: record_written(pattern_name, path),
+                        color_future=color_futures[pattern_name],
+                        servers=servers
+                    )
+                    completed = True
+                finally:
+                    if servers:
+                        # Only reuse a group that answered the whole job and is still running
+                        if completed and all(proc.returncode is None for proc in servers):
+                            idle_servers.append(servers)
+                        else:
+                            retired_servers.extend(servers)
+            finish_pattern(pattern_name, returncode)
+        
+        try:
+            await gather_or_cancel(*(render_bounded(pattern_name) for pattern_name in duplicates))
+        finally:
+            await asyncio.gather(
+                *(kill_server(proc) for proc in retired_servers),
+                *(stop_server(proc) for servers in idle_servers for proc in servers)
+            )
     
-    # Get blend file
-    blend_file = Path(config['blend_file'])
-    if not blend_file.exists():
-        print(f"Error: Blend file not found: {blend_file}")
-        sys.exit(1)
+    # Extract thread colors in render order on worker threads, so they are ready before Blender needs them
+    extractor = ThreadPoolExecutor(max_workers=2)
+    color_futures = {
+        pattern_name: extractor.submit(get_thread_color, patterns_dir / pattern_name, color_cache)
+        for pattern_name in duplicates
+    }
     
-    # Run Blender
     try:
-        print(f"Starting Blender render...")
-        print(f"Blend file: {blend_file}")
-        print()
-        
-        env = os.environ.copy()
-        env['PYTHONUNBUFFERED'] = '1'
+        if jobs > 1:
+            print(f"Rendering {jobs} patterns at a time")
+            print()
+        asyncio.run(render_patterns())
         
-        result = subprocess.run(
-            [str(blender_exe), str(blend_file), '--background', '--python', str(temp_script)],
-            env=env,
-            cwd=os.getcwd()
-        )
+        if converter:
+            print(f"Encoding {len(conversions)} PNG file(s)...")
+            for future in conversions:
+                future.result()  # Wait and surface conversion errors
+            shutil.rmtree(staging_root, ignore_errors=True)
         
-        if result.returncode == 0:
-            print()
-            print("=" * 60)
-            print("✓ RENDER COMPLETE!")
-            print("=" * 60)
-            print(f"Output saved to: {config['output_dir']}/")
-        else:
-            print()
-            print("=" * 60)
-            print("✗ RENDER FAILED")
-            print("=" * 60)
-            sys.exit(1)
+        for pattern_name, copies in duplicates.items():
+            if copies:
+                copy_duplicate_outputs(pattern_name, written[pattern_name], copies)
     
     finally:
-        # Clean up temp script
-        if temp_script.exists():
-            temp_script.unlink()
-        
-        # Restore placeholders in original script
-        restore_content = script_content.replace(config['pattern'], '__PATTERN_PLACEHOLDER__')
-        restore_content = restore_content.replace(blender_engine, '__ENGINE_PLACEHOLDER__')
-        restore_content = restore_content.replace(str(config['samples']), '__SAMPLES_PLACEHOLDER__')
-        restore_content = restore_content.replace(str(config['resolution_scale']), '__SCALE_PLACEHOLDER__')
-        restore_content = restore_content.replace(str(config.get('output_width', 480)), '__OUTPUT_WIDTH_PLACEHOLDER__')
-        restore_content = restore_content.replace(str(config.get('output_height', 480)), '__OUTPUT_HEIGHT_PLACEHOLDER__')
-        restore_content = restore_content.replace(presets_str, '__PRESETS_PLACEHOLDER__')
-        restore_content = restore_content.replace(cameras_str, '__CAMERAS_PLACEHOLDER__')
-        if color_replacement:  # Only restore if there was a replacement
-            restore_content = restore_content.replace(color_replacement, '__THREADS_COLOR_PLACEHOLDER__')
+        extractor.shutdown(cancel_futures=True)
+        if converter:
+            converter.shutdown()
         
-        with open(render_script_path, 'w', encoding='utf-8') as f:
-            f.write(restore_content)
+        save_color_cache(color_cache_path, color_cache)
+    
+    print("=" * 60)
+    print(f"✓ ALL {len(patterns_to_render)} PATTERNS RENDERED!")
+    print("=" * 60)
+    print(f"Output saved to: {config['output_dir']}/")
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Parallel launcher for Rashguard renders.
+Splits one render script across several Blender processes, one per GPU.
+Each process renders its block of presets (or every N-th camera) via '--shard i/N'.
+"""
+
+import os
+import sys
+import subprocess
+import argparse
+from multiprocessing import Pool
+
+def blender_command(blender_exe, blend_file, script_path):
+    """Command line that runs a Python script in background Blender."""
+    return [str(blender_exe), str(blend_file), '--background', '--python', str(script_path)]
+
+def shard_calls(base_cmd, num_gpus, env=None):
+    """
+    Build one (command, env) pair per shard from a blender_command() list.
+    Shard i only sees GPU i, so Cycles picks a different device in each process.
+    """
+    base_env = os.environ.copy() if env is None else env
+    calls = []
+    for i in range(num_gpus):
+        cmd = [*base_cmd, '--', '--shard', f"{i}/{num_gpus}"]
+        shard_env = {**base_env, 'CUDA_VISIBLE_DEVICES': str(i), 'HIP_VISIBLE_DEVICES': str(i)}
+        calls.append((cmd, shard_env))
+    return calls
+
+def do_call(call):
+    """Run a single Blender shard and return its exit code."""
+    cmd, env = call
+    return subprocess.run(cmd, env=env, cwd=os.getcwd()).returncode
+
+def do_calls(calls):
+    """Run all shards concurrently. Returns 0 if every shard succeeded, else the first failing exit code."""
+    with Pool(len(calls)) as pool:
+        return_codes = pool.map(do_call, calls)
+    return next((code for code in return_codes if code != 0), 0)
+
+def main():
+    parser = argparse.ArgumentParser(description='Render one Blender script across several GPUs')
+    parser.add_argument('script', help='Render script to run inside Blender')
+    parser.add_argument('--blender', required=True, help='Blender executable')
+    parser.add_argument('--blend', default='Rashguard mockup.blend', help='Blend file (default: Rashguard mockup.blend)')
+    parser.add_argument('--gpus', type=int, default=1, help='Number of GPUs / Blender processes (default: 1)')
+
+    args = parser.parse_args()
+
+    env = os.environ.copy()
+    env['PYTHONUNBUFFERED'] = '1'
+
+    base_cmd = blender_command(args.blender, args.blend, args.script)
+    sys.exit(do_calls(shard_calls(base_cmd, max(1, args.gpus), env)))
+
+if __name__ == '__main__':
+    main()
@@ -6,62 +6,193 @@ Loads pattern images and renders using Camera.001
 import bpy
 import os
 import sys
+import json
+import functools
+import numpy as np
+from collections import defaultdict
 
 # Configuration
-PATTERN_NAME = "__PATTERN_PLACEHOLDER__"  # Filename in /patterns/ folder
-PATTERN_BASE = "__PATTERN_BASE_PLACEHOLDER__"  # Pattern name without extension (for output files)
-OUTPUT_DIR = "/output"
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PATTERNS_DIR = os.path.join(SCRIPT_DIR, "patterns")
+DEFAULT_OUTPUT_DIR = os.path.join(SCRIPT_DIR, "output")
 CAMERA_NAME = "1. Camera (close front)"  # Active camera in your scene
 RASHGUARD_OBJECT = "Rashguard"  # The mesh object with 7 material slots
 BLEND_FILE = "Rashguard mockup.blend"
-RENDER_ENGINE = "__ENGINE_PLACEHOLDER__"
-RENDER_SAMPLES = __SAMPLES_PLACEHOLDER__
-RESOLUTION_SCALE = __SCALE_PLACEHOLDER__
-OUTPUT_WIDTH = __SCALE_PLACEHOLDER__0
-OUTPUT_HEIGHT = __SCALE_PLACEHOLDER__0
-PRESETS = __PRESETS_PLACEHOLDER__
-CAMERAS_TO_RENDER = __CAMERAS_PLACEHOLDER__
-THREADS_COLOR = "__THREADS_COLOR_PLACEHOLDER__"
+GPU_BACKENDS = ('OPTIX', 'CUDA', 'HIP', 'METAL')  # Preferred Cycles compute backends, in order
+ADAPTIVE_THRESHOLD = 0.01  # Cycles adaptive sampling noise threshold (lower = cleaner, slower)
+DEBUG = bool(os.environ.get('AUTO3D_DEBUG'))  # Verbose per-node logging
+RENDER_WRITTEN_MARKER = "RENDER_WRITTEN:"  # Printed for every finished file, parsed by render_cli.py
+
+_INV_255 = 1.0 / 255.0
+
+def apply_params(params):
+    """Set the per-render configuration from a RENDER_PARAMS dict (see render_cli.py)."""
+    global PATTERN_NAME, PATTERN_BASE, OUTPUT_DIR, RENDER_ENGINE, RENDER_SAMPLES, RESOLUTION_SCALE
+    global OUTPUT_WIDTH, OUTPUT_HEIGHT, PRESETS, CAMERAS_TO_RENDER, THREADS_COLOR, STAGING_DIR, OUTPUT_EXT
+    global HYBRID_CPU
+    
+    PATTERN_NAME = params.get("pattern", "")  # Filename in /patterns/ folder
+    PATTERN_BASE = params.get("pattern_base") or os.path.splitext(PATTERN_NAME)[0]  # Pattern name without extension (for output files)
+    OUTPUT_DIR = params.get("output_dir") or DEFAULT_OUTPUT_DIR
+    RENDER_ENGINE = params.get("engine", "CYCLES")
+    RENDER_SAMPLES = int(params.get("samples", 32))
+    RESOLUTION_SCALE = int(params.get("resolution_scale", 100))
+    OUTPUT_WIDTH = int(params.get("output_width", 480))
+    OUTPUT_HEIGHT = int(params.get("output_height", 480))
+    PRESETS = params.get("presets", [])
+    CAMERAS_TO_RENDER = frozenset(params.get("cameras", []))
+    THREADS_COLOR = params.get("threads_color")
+    STAGING_DIR = params.get("staging_dir", "")  # If set, write uncompressed TIFFs here; render_cli.py converts them to PNG
+    OUTPUT_EXT = ".tif" if STAGING_DIR else ".png"
+    HYBRID_CPU = bool(params.get("hybrid_cpu", True))  # False when other Blender processes render at the same time
+
+# Render parameters, passed by render_cli.py as JSON in the RENDER_PARAMS environment variable
+apply_params(json.loads(os.environ.get("RENDER_PARAMS", "{}")))
+
+# Filename-safe translations: patterns also drop parentheses, camera names keep them
+_SAFE_TBL = str.maketrans({' ': '_', '.': '_', '(': '', ')': ''})
+_SAFE_CAMERA_TBL = str.maketrans({' ': '_', '.': '_'})
+
+# Node lookups for the rashguard object, see _get_rashguard_nodes()
+_rashguard_cache = {}
+
+# Camera objects, see get_all_cameras()
+_camera_cache = None
+
+# Modification time of each cached pattern, used to detect edits on disk
+_pattern_mtimes = {}
+
+# Settings last passed to _configure_scene_once(), a render server only reapplies them on change
+_scene_settings = None
+
+# (path, image) of the pattern assigned by the last render_pattern() call
+_current_pattern = None
+
+@functools.lru_cache(maxsize=8)
+def _load_pattern_cached(image_path):
+    """Load and decode a pattern image once per absolute path."""
+    return bpy.data.images.load(image_path, check_existing=True)
 
 def load_pattern(image_filename):
     """Load image from patterns folder."""
-    # Get the script directory and build patterns path
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    patterns_dir = os.path.join(script_dir, "patterns")
-    image_path = os.path.join(patterns_dir, image_filename)
+    image_path = os.path.join(PATTERNS_DIR, image_filename)
+    
+    # The stat doubles as the existence check
+    try:
+        mtime_ns = os.stat(image_path).st_mtime_ns
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Pattern not found: {image_path}\nPlease place '{image_filename}' in the patterns/ folder") from e
     
-    if not os.path.exists(image_path):
-        raise FileNotFoundError(f"Pattern not found: {image_path}\nPlease place '{image_filename}' in the patterns/ folder")
+    # Drop the cache if the file changed since it was loaded
+    stale = _pattern_mtimes.get(image_path, mtime_ns) != mtime_ns
+    if stale:
+        _load_pattern_cached.cache_clear()
+    
+    try:
+        img = _load_pattern_cached(image_path)
+    except RuntimeError as e:
+        raise FileNotFoundError(f"Pattern could not be loaded: {image_path}") from e
+    if stale:
+        img.reload()  # check_existing hands back the old datablock, re-read it from disk
+    _pattern_mtimes[image_path] = mtime_ns
     
-    img = bpy.data.images.load(image_path, check_existing=True)
     print(f"✓ Loaded pattern from: {image_path}")
     return img
 
+def _release_pattern(image_path, image):
+    """
+    Free a pattern image that is no longer assigned. Blender doesn't purge orphan images
+    during a session, so a render server would otherwise keep every decoded pattern in RAM.
+    """
+    # The load cache must never hand back a removed datablock (ReferenceError)
+    _load_pattern_cached.cache_clear()
+    _pattern_mtimes.pop(image_path, None)
+    
+    if image.users == 0:
+        bpy.data.images.remove(image)
+    else:
+        image.buffers_free()  # Still used elsewhere in the scene, drop only the decoded pixels
+
+def _collect_tex_image_nodes(obj):
+    """Find all Image Texture nodes in the object's node-based materials."""
+    nodes = []
+    for slot in obj.material_slots:
+        mat = slot.material
+        if not mat or not mat.use_nodes:
+            continue
+        nodes.extend(node for node in mat.node_tree.nodes if node.type == 'TEX_IMAGE')
+    return nodes
+
+def _get_rashguard_nodes():
+    """
+    Return cached node lookups for the rashguard object:
+    {'obj': object, 'tex_image': [TEX_IMAGE nodes], 'color_sockets': [(slot_number, label, socket)]}.
+    'color_sockets' is filled in lazily by apply_threads_color.
+    The cache is rebuilt if the object datablock is replaced.
+    """
+    obj = bpy.data.objects.get(RASHGUARD_OBJECT)
+    if not obj:
+        raise ValueError(f"Object '{RASHGUARD_OBJECT}' not found")
+    
+    pointer = obj.as_pointer()
+    if _rashguard_cache.get('pointer') != pointer:
+        _rashguard_cache.clear()
+        _rashguard_cache['pointer'] = pointer
+        _rashguard_cache['obj'] = obj
+        _rashguard_cache['tex_image'] = _collect_tex_image_nodes(obj)
+    return _rashguard_cache
+
 def assign_pattern_to_rashguard_materials(image):
     """
     Assign the same image to all TEX_IMAGE nodes in the rashguard object's materials.
     This ensures all 7 material slots use the same pattern.
     """
     updated_count = 0
+    for node in _get_rashguard_nodes()['tex_image']:
+        # Reassigning the same image still re-tags the material for a shader recompile
+        if node.image != image:  # bpy wrappers compare by datablock, not Python identity
+            node.image = image
+            updated_count += 1
     
-    obj = bpy.data.objects.get(RASHGUARD_OBJECT)
-    if not obj:
-        raise ValueError(f"Object '{RASHGUARD_OBJECT}' not found")
+    print(f"✓ Updated {updated_count} image texture nodes in rashguard materials")
+    return updated_count
+
+def _collect_thread_color_sockets(obj):
+    """
+    Find every 'Color' input that the threads color should drive in slots 8-12.
+    Materials and node groups shared between slots are walked only once
+    (keyed by datablock pointer, so linked datablocks with equal names stay distinct).
+    Returns a list of (slot_number, label, socket).
+    """
+    # Only process slots 8-12 (0-indexed: 7-11) for threads
+    thread_slots = [(idx + 1, obj.material_slots[idx].material) for idx in range(7, min(12, len(obj.material_slots)))]
     
-    # Loop through all material slots on the rashguard
-    for slot in obj.material_slots:
-        mat = slot.material
-        if not mat or not mat.use_nodes:
+    sockets = []
+    visited_materials = set()
+    visited_groups = set()
+    for slot_number, mat in thread_slots:
+        if not mat or mat.as_pointer() in visited_materials:
             continue
+        visited_materials.add(mat.as_pointer())
+        
+        if not mat.use_nodes:
+            mat.use_nodes = True
         
-        # Update all Image Texture nodes in this material
         for node in mat.node_tree.nodes:
-            if node.type == 'TEX_IMAGE':
-                node.image = image
-                updated_count += 1
+            # GROUP nodes expose their own Color input per instance
+            if 'Color' in node.inputs:
+                label = f"GROUP '{node.name}'" if node.type == 'GROUP' else f"'{node.name}'"
+                sockets.append((slot_number, label, node.inputs['Color']))
+            
+            # Nodes inside a group are shared by every instance, collect them once
+            group_tree = node.node_tree if node.type == 'GROUP' else None
+            if group_tree and group_tree.as_pointer() not in visited_groups:
+                visited_groups.add(group_tree.as_pointer())
+                for sub_node in group_tree.nodes:
+                    if 'Color' in sub_node.inputs:
+                        sockets.append((slot_number, f"'{sub_node.name}' inside GROUP", sub_node.inputs['Color']))
     
-    print(f"✓ Updated {updated_count} image texture nodes in rashguard materials")
-    return updated_count
+    return sockets
 
 def apply_threads_color(color_hex):
     """Apply color to threads material slots (8-12) only."""
@@ -70,80 +201,213 @@ def apply_threads_color(color_hex):
         return
     
     try:
-        hex_str = str(color_hex).lstrip('#')
-        r = int(hex_str[0:2], 16) / 255.0
-        g = int(hex_str[2:4], 16) / 255.0
-        b = int(hex_str[4:6], 16) / 255.0
-        color_rgba = (r, g, b, 1.0)
+        hex_bytes = bytes.fromhex(str(color_hex).lstrip('#'))
+        if len(hex_bytes) != 3:
+            raise ValueError(f"expected #RRGGBB, got '{color_hex}'")
+        r, g, b = (v * _INV_255 for v in hex_bytes)
+        # One buffer shared by every socket write
+        color_rgba = np.array([r, g, b, 1.0], dtype=np.float32)
     except Exception as e:
         print(f"✗ ERROR: Convert color failed: {e}")
         return
     
-    obj = bpy.data.objects.get(RASHGUARD_OBJECT)
-    if not obj:
-        print(f"✗ ERROR: Object '{RASHGUARD_OBJECT}' not found")
+    try:
+        rashguard = _get_rashguard_nodes()
+    except ValueError as e:
+        print(f"✗ ERROR: {e}")
         return
     
+    if 'color_sockets' not in rashguard:
+        rashguard['color_sockets'] = _collect_thread_color_sockets(rashguard['obj'])
+    
     updated_count = 0
-    # Only process slots 8-12 (0-indexed: 7-11) for threads
-    for idx in range(7, min(12, len(obj.material_slots))):
-        slot = obj.material_slots[idx]
-        mat = slot.material
-        if not mat:
-            continue
+    log_lines = []
+    for slot_number, label, socket in rashguard['color_sockets']:
+        try:
+            socket.default_value = color_rgba
+            updated_count += 1
+            if DEBUG:
+                log_lines.append(f"   Thread slot {slot_number}: Updated {label} Color")
+        except Exception as e:
+            log_lines.append(f"   Thread slot {slot_number}: Failed to update {label} Color - {e}")
+    
+    # Write everything in one go instead of a print per socket
+    log_lines.append(f"✓ Applied threads color ({color_hex}) to {updated_count} thread Color inputs (slots 8-12)")
+    sys.stdout.write("\n".join(log_lines) + "\n")
+    return updated_count
+
+def configure_gpu(scene, hybrid_cpu=False):
+    """
+    Switch Cycles to GPU compute using the first available backend.
+    With hybrid_cpu the CPU is used as an extra device (only sensible for a single Blender process).
+    Falls back to CPU rendering if no GPU device is found.
+    """
+    try:
+        prefs = bpy.context.preferences.addons['cycles'].preferences
         
-        if not mat.use_nodes:
-            mat.use_nodes = True
+        # Pick the first backend that actually has devices on this machine
+        backend = None
+        for candidate in GPU_BACKENDS:
+            try:
+                prefs.compute_device_type = candidate
+            except TypeError:
+                continue  # Backend not supported by this Blender build
+            prefs.get_devices()
+            if any(d.type == candidate for d in prefs.devices):
+                backend = candidate
+                break
         
-        # Check all nodes in the material
-        for node in mat.node_tree.nodes:
-            # Try GROUP nodes first (they expose inputs)
-            if node.type == 'GROUP':
-                # Check if GROUP has Color input
-                if 'Color' in node.inputs:
-                    try:
-                        node.inputs['Color'].default_value = color_rgba
-                        updated_count += 1
-                        print(f"   Thread slot {idx+1}: Updated GROUP '{node.name}' Color")
-                    except Exception as e:
-                        print(f"   Thread slot {idx+1}: Failed to update GROUP Color - {e}")
-                
-                # Also check inside GROUP for nodes with Color input
-                if node.node_tree:
-                    for sub_node in node.node_tree.nodes:
-                        if 'Color' in sub_node.inputs:
-                            try:
-                                sub_node.inputs['Color'].default_value = color_rgba
-                                updated_count += 1
-                                print(f"   Thread slot {idx+1}: Updated '{sub_node.name}' Color inside GROUP")
-                            except Exception as e:
-                                print(f"   Thread slot {idx+1}: Failed - {e}")
-            
-            # Try direct nodes with Color input
-            else:
-                if 'Color' in node.inputs:
-                    try:
-                        node.inputs['Color'].default_value = color_rgba
-                        updated_count += 1
-                        print(f"   Thread slot {idx+1}: Updated '{node.name}' Color")
-                    except Exception as e:
-                        print(f"   Thread slot {idx+1}: Failed - {e}")
-    
-    print(f"✓ Applied threads color ({color_hex}) to {updated_count} thread Color inputs (slots 8-12)")
-    return updated_count
+        if backend is None:
+            print("ℹ️  No GPU compute device found, rendering on CPU")
+            return None
+        
+        # Let the CPU join in as an extra device (hybrid rendering)
+        for device in prefs.devices:
+            device.use = device.type in GPU_BACKENDS or (hybrid_cpu and device.type == 'CPU')
+        
+        scene.cycles.device = 'GPU'
+        scene.render.threads_mode = 'AUTO'
+        
+        enabled = [d.name for d in prefs.devices if d.use]
+        print(f"✓ Cycles GPU compute enabled ({backend}): {', '.join(enabled)}")
+        return backend
+    except Exception as e:
+        print(f"✗ GPU setup failed, rendering on CPU: {e}")
+        return None
+
+def parse_shard(argv):
+    """
+    Read an optional '--shard i/N' argument passed after '--' on the Blender command line.
+    Returns (index, count); (0, 1) means render everything.
+    """
+    args = argv[argv.index('--') + 1:] if '--' in argv else []
+    if '--shard' not in args:
+        return 0, 1
+    
+    index, count = args[args.index('--shard') + 1].split('/')
+    index, count = int(index), int(count)
+    if not 0 <= index < count:
+        raise ValueError(f"Invalid shard {index}/{count}")
+    return index, count
+
+def _report_written_file(scene, *args):
+    """
+    render_write handler: print the path of each file as soon as Blender has written it,
+    so render_cli.py can start post-processing while the next frame renders.
+    """
+    if '#' in scene.render.filepath:
+        path = scene.render.frame_path(frame=scene.frame_current)
+    else:
+        path = bpy.path.abspath(scene.render.filepath)
+    print(f"{RENDER_WRITTEN_MARKER} {path}", flush=True)
+
+def get_output_size():
+    """Return the final (width, height) in pixels after applying RESOLUTION_SCALE."""
+    if RESOLUTION_SCALE < 100:
+        return int(OUTPUT_WIDTH * RESOLUTION_SCALE / 100), int(OUTPUT_HEIGHT * RESOLUTION_SCALE / 100)
+    return OUTPUT_WIDTH, OUTPUT_HEIGHT
+
+def _configure_scene_once(scene, width, height, hybrid_cpu=False):
+    """
+    Apply render settings that are identical for every camera/frame.
+    Called once before rendering so the per-frame loop only changes camera, frame and filepath.
+    """
+    scene.render.engine = RENDER_ENGINE
+    if STAGING_DIR:
+        # Skip zlib on the render path, the PNG encode happens later outside Blender
+        scene.render.image_settings.file_format = 'TIFF'
+        scene.render.image_settings.tiff_codec = 'NONE'
+        scene.render.image_settings.color_depth = '8'
+    else:
+        scene.render.image_settings.file_format = 'PNG'
+        scene.render.image_settings.compression = 0  # Fastest write, larger files (zlib is single-threaded)
+    scene.render.image_settings.color_mode = 'RGBA'
+    scene.render.resolution_x = width
+    scene.render.resolution_y = height
+    
+    # Engine-specific settings
+    if RENDER_ENGINE == 'CYCLES':
+        # RENDER_SAMPLES is the per-pixel cap, converged pixels stop early
+        scene.cycles.samples = RENDER_SAMPLES
+        scene.cycles.use_adaptive_sampling = True
+        scene.cycles.adaptive_threshold = ADAPTIVE_THRESHOLD
+        scene.cycles.adaptive_min_samples = 0  # 0 = automatic
+        
+        # Keep geometry, BVH and textures between renders (only the camera/frame changes).
+        # Costs extra (V)RAM for the lifetime of the Blender process.
+        scene.render.use_persistent_data = True
+        
+        backend = configure_gpu(scene, hybrid_cpu)
+        if backend:
+            scene.cycles.debug_use_spatial_splits = False  # Faster BVH build on GPU
+        
+        # Large tiles keep a GPU busy, small ones spread low-res renders over CPU threads
+        scene.cycles.use_auto_tile = True
+        scene.cycles.tile_size = 256 if scene.cycles.device == 'GPU' else 64
+        # Denoise on the GPU: OptiX on NVIDIA, otherwise OpenImageDenoise (GPU-accelerated when available)
+        scene.cycles.use_denoising = True
+        try:
+            scene.cycles.denoiser = 'OPTIX' if backend == 'OPTIX' else 'OPENIMAGEDENOISE'
+        except TypeError:
+            scene.cycles.denoiser = 'OPENIMAGEDENOISE'
+        scene.cycles.denoising_input_passes = 'RGB_ALBEDO_NORMAL'
+        if hasattr(scene.cycles, 'denoising_use_gpu'):  # Blender 4.1+
+            scene.cycles.denoising_use_gpu = backend is not None
+    elif RENDER_ENGINE == 'BLENDER_EEVEE_NEXT':
+        scene.eevee.taa_render_samples = RENDER_SAMPLES  # EEVEE quality
 
 def get_all_cameras():
-    """Get all camera objects in the scene."""
-    cameras = [obj for obj in bpy.data.objects if obj.type == 'CAMERA']
-    return cameras
+    """Get all camera objects in the scene. Scanned once, call reset_camera_cache() after adding cameras."""
+    global _camera_cache
+    if _camera_cache is None:
+        _camera_cache = [obj for obj in bpy.data.objects if obj.type == 'CAMERA']
+    return _camera_cache
+
+def reset_camera_cache():
+    """Forget the cached camera list so the next get_all_cameras() rescans the scene."""
+    global _camera_cache
+    _camera_cache = None
+
+def _contiguous_runs(frames):
+    """Split a sorted list of frame numbers into runs of consecutive frames."""
+    runs = []
+    for frame in frames:
+        if runs and frame == runs[-1][-1] + 1:
+            runs[-1].append(frame)
+        else:
+            runs.append([frame])
+    return runs
+
+def _render_frame_range(scene, frame_start, frame_end):
+    """
+    Render every frame from frame_start to frame_end with one animation render.
+    Unlike write_still, animation renders honour the .blend's frame step, overwrite and
+    placeholder settings, so those are forced for the call and restored afterwards.
+    """
+    saved = (scene.frame_start, scene.frame_end, scene.frame_step,
+             scene.render.use_overwrite, scene.render.use_placeholder)
+    try:
+        scene.frame_start = frame_start
+        scene.frame_end = frame_end
+        scene.frame_step = 1  # Don't skip frames inside the run
+        scene.render.use_overwrite = True  # Existing files from earlier runs would be skipped (no RENDER_WRITTEN)
+        scene.render.use_placeholder = False
+        bpy.ops.render.render(animation=True)
+    finally:
+        (scene.frame_start, scene.frame_end, scene.frame_step,
+         scene.render.use_overwrite, scene.render.use_placeholder) = saved
 
-def render_presets(output_dir, pattern_name):
+def render_presets(output_dir, pattern_name, shard=(0, 1)):
     """
     Render multiple presets: list of [camera, frame] pairs.
+    With shard=(i, N) only the i-th of N contiguous blocks of (camera, frame) is rendered,
+    so consecutive frames stay in the same shard and can still render as one batch.
     """
     if not PRESETS:
         return
     
+    shard_index, shard_count = shard
+    
     print(f"\n🎬 PRESET RENDER MODE")
     print(f"   Total presets: {len(PRESETS)}")
     
@@ -151,69 +415,87 @@ def render_presets(output_dir, pattern_name):
     all_cameras = get_all_cameras()
     camera_dict = {cam.name: cam for cam in all_cameras}
     
+    # All presets ordered by camera, then frame
+    all_frames = defaultdict(set)
     for preset_idx, (camera_name, frame_num) in enumerate(PRESETS, 1):
-        print(f"\n   [{preset_idx}/{len(PRESETS)}] {camera_name} @ frame {frame_num}")
-        
-        # Find the preset camera
         if camera_name not in camera_dict:
-            print(f"   ✗ Camera '{camera_name}' not found, skipping")
+            if shard_index == 0:
+                print(f"\n   [{preset_idx}/{len(PRESETS)}] {camera_name} @ frame {frame_num}")
+                print(f"   ✗ Camera '{camera_name}' not found, skipping")
             continue
-        
-        preset_cam = camera_dict[camera_name]
-        
-        # Set scene and camera
-        scene = bpy.context.scene
-        scene.camera = preset_cam
-        scene.frame_set(frame_num)
-        
-        # Apply resolution scaling
-        if RESOLUTION_SCALE < __SCALE_PLACEHOLDER__:
-            final_width = int(OUTPUT_WIDTH * RESOLUTION_SCALE / __SCALE_PLACEHOLDER__)
-            final_height = int(OUTPUT_HEIGHT * RESOLUTION_SCALE / __SCALE_PLACEHOLDER__)
+        all_frames[camera_name].add(frame_num)
+    ordered = [(camera_name, frame) for camera_name, frames in all_frames.items() for frame in sorted(frames)]
+    
+    # This shard's contiguous block
+    block = ordered[len(ordered) * shard_index // shard_count:len(ordered) * (shard_index + 1) // shard_count]
+    if shard_count > 1:
+        print(f"   Shard {shard_index + 1}/{shard_count}: {len(block)} preset(s)")
+    
+    scene = bpy.context.scene
+    final_width, final_height = get_output_size()
+    
+    # Output filename parts are the same for every preset, build them once
+    safe_pattern = PATTERN_BASE.translate(_SAFE_TBL)
+    safe_cameras = {name: name.translate(_SAFE_CAMERA_TBL) for name in camera_dict}
+    
+    # Group frames by camera so consecutive frames render in a single animation call
+    frames_by_camera = defaultdict(set)
+    for camera_name, frame_num in block:
+        frames_by_camera[camera_name].add(frame_num)
+    
+    rendered = 0
+    for camera_name, frames in frames_by_camera.items():
+        scene.camera = camera_dict[camera_name]
+        safe_camera = safe_cameras[camera_name]
+        # '#' in a name would be read as a frame-number placeholder, render those frame by frame
+        if '#' in safe_pattern + safe_camera:
+            runs = [[frame] for frame in sorted(frames)]
         else:
-            final_width = OUTPUT_WIDTH
-            final_height = OUTPUT_HEIGHT
-        
-        # Create output filename with pattern name prefix
-        safe_pattern = PATTERN_BASE.replace(" ", "_").replace(".", "_").replace("(", "").replace(")", "")
-        safe_camera = preset_cam.name.replace(" ", "_").replace(".", "_")
-        output_file = os.path.join(output_dir, f"{safe_pattern}_f{frame_num}_{safe_camera}.png")
-        
-        # Configure render
-        scene.render.engine = RENDER_ENGINE
-        scene.render.filepath = output_file
-        scene.render.image_settings.file_format = 'PNG'
-        scene.render.image_settings.color_mode = 'RGBA'
-        scene.render.resolution_x = final_width
-        scene.render.resolution_y = final_height
-        
-        # Engine-specific settings
-        if RENDER_ENGINE == '__ENGINE_PLACEHOLDER__':
-            scene.cycles.samples = RENDER_SAMPLES
-            scene.cycles.use_denoising = True
-        elif RENDER_ENGINE == 'BLENDER_EEVEE_NEXT':
-            scene.eevee.taa_render_samples = RENDER_SAMPLES
+            runs = _contiguous_runs(sorted(frames))
         
-        print(f"                    -> {output_file} ({final_width}x{final_height})", flush=True)
-        sys.stdout.flush()
-        
-        # Render
-        bpy.ops.render.render(write_still=True)
-        
-        print(f"                    ✓ COMPLETE", flush=True)
-        sys.stdout.flush()
+        for run in runs:
+            if len(run) > 1:
+                print(f"\n   {camera_name} @ frames {run[0]}-{run[-1]}")
+                
+                # Blender replaces '#' with the frame number (no zero padding for a single '#')
+                scene.render.filepath = os.path.join(output_dir, f"{safe_pattern}_f#_{safe_camera}")
+                
+                print(f"                    -> {scene.render.filepath}{OUTPUT_EXT} ({final_width}x{final_height})", flush=True)
+                sys.stdout.flush()
+                
+                # Render
+                _render_frame_range(scene, run[0], run[-1])
+            else:
+                frame_num = run[0]
+                print(f"\n   {camera_name} @ frame {frame_num}")
+                scene.frame_set(frame_num)
+                
+                # Create output filename with pattern name prefix
+                output_file = os.path.join(output_dir, f"{safe_pattern}_f{frame_num}_{safe_camera}{OUTPUT_EXT}")
+                scene.render.filepath = output_file
+                
+                print(f"                    -> {output_file} ({final_width}x{final_height})", flush=True)
+                sys.stdout.flush()
+                
+                # Render
+                bpy.ops.render.render(write_still=True)
+            
+            rendered += len(run)
+            print(f"                    ✓ COMPLETE", flush=True)
+            sys.stdout.flush()
     
-    print(f"\n✓ All {len(PRESETS)} presets rendered!")
+    print(f"\n✓ All {rendered} presets rendered!")
 
-def render_all_cameras(output_dir):
+def render_all_cameras(output_dir, shard=(0, 1)):
     """
     Render the scene with each camera.
     Creates a numbered output file for each camera.
+    With shard=(i, N) only every N-th camera starting at i is rendered.
     """
     # Get all cameras from scene
     all_cameras = get_all_cameras()
     
-    # Filter to only render selected cameras
+    # Filter to only render selected cameras (set lookup, keeps scene order for stable numbering)
     if CAMERAS_TO_RENDER:
         cameras = [cam for cam in all_cameras if cam.name in CAMERAS_TO_RENDER]
     else:
@@ -231,42 +513,23 @@ def render_all_cameras(output_dir):
     print(f"   Resolution: {RESOLUTION_SCALE}%")
     print(f"   Output Size: {OUTPUT_WIDTH}x{OUTPUT_HEIGHT}px")
     
-    # Get base resolution and apply scaling
     scene = bpy.context.scene
+    final_width, final_height = get_output_size()
     
-    # Use output dimensions directly (applies resolution scale if needed)
-    if RESOLUTION_SCALE < __SCALE_PLACEHOLDER__:
-        final_width = int(OUTPUT_WIDTH * RESOLUTION_SCALE / __SCALE_PLACEHOLDER__)
-        final_height = int(OUTPUT_HEIGHT * RESOLUTION_SCALE / __SCALE_PLACEHOLDER__)
-    else:
-        final_width = OUTPUT_WIDTH
-        final_height = OUTPUT_HEIGHT
+    # Keep the global camera index so shard outputs don't collide
+    shard_index, shard_count = shard
+    shard_cameras = list(enumerate(cameras, 1))[shard_index::shard_count]
+    if shard_count > 1:
+        print(f"   Shard {shard_index + 1}/{shard_count}: {len(shard_cameras)} camera(s)")
     
-    for i, cam in enumerate(cameras, 1):
+    for i, cam in shard_cameras:
         # Set this camera as active
-        bpy.context.scene.camera = cam
+        scene.camera = cam
         
         # Create output filename based on camera name
-        safe_name = cam.name.replace(" ", "_").replace(".", "_")
-        output_file = os.path.join(output_dir, f"{i:02d}_{safe_name}.png")
-        
-        # Configure render
-        scene = bpy.context.scene
-        scene.render.engine = RENDER_ENGINE
+        safe_name = cam.name.translate(_SAFE_CAMERA_TBL)
+        output_file = os.path.join(output_dir, f"{i:02d}_{safe_name}{OUTPUT_EXT}")
         scene.render.filepath = output_file
-        scene.render.image_settings.file_format = 'PNG'
-        scene.render.image_settings.color_mode = 'RGBA'
-        
-        # Set resolution
-        scene.render.resolution_x = final_width
-        scene.render.resolution_y = final_height
-        
-        # Engine-specific settings
-        if RENDER_ENGINE == '__ENGINE_PLACEHOLDER__':
-            scene.cycles.samples = RENDER_SAMPLES  # Cycles quality
-            scene.cycles.use_denoising = True
-        elif RENDER_ENGINE == 'BLENDER_EEVEE_NEXT':
-            scene.eevee.taa_render_samples = RENDER_SAMPLES  # EEVEE quality
         
         # Output progress markers
         progress_line = f"[{i}/{len(cameras)}] Rendering: {cam.name}"
@@ -283,38 +546,61 @@ def render_all_cameras(output_dir):
         print(complete_line, flush=True)
         sys.stdout.flush()
     
-    print(f"\n✓ All {len(cameras)} renders complete!")
+    print(f"\n✓ All {len(shard_cameras)} renders complete!")
+
+def render_pattern(shard=(0, 1)):
+    """Render the current pattern (see apply_params()) into the output or staging folder."""
+    global _scene_settings, _current_pattern
+    
+    if not PATTERN_NAME:
+        raise ValueError("No pattern given, run this script through render_cli.py (RENDER_PARAMS not set)")
+    
+    # Load pattern image
+    pattern_image = load_pattern(PATTERN_NAME)
+    
+    # Assign to rashguard materials only
+    assign_pattern_to_rashguard_materials(pattern_image)
+    
+    # Render server: the previous job's pattern is unassigned now, free it
+    if _current_pattern and _current_pattern[1] != pattern_image:
+        _release_pattern(*_current_pattern)
+    _current_pattern = (os.path.join(PATTERNS_DIR, PATTERN_NAME), pattern_image)
+    
+    # Apply thread color (already extracted in render_cli.py and passed via THREADS_COLOR)
+    apply_threads_color(THREADS_COLOR)
+    
+    # Render settings are the same for every camera/frame, set them once
+    width, height = get_output_size()
+    # Shards of one render (--gpus) run side by side, keep the CPU out of those too
+    hybrid_cpu = HYBRID_CPU and shard[1] == 1
+    settings = (RENDER_ENGINE, RENDER_SAMPLES, width, height, bool(STAGING_DIR), hybrid_cpu)
+    if settings != _scene_settings:
+        _configure_scene_once(bpy.context.scene, width, height, hybrid_cpu)
+        _scene_settings = settings
+    if _report_written_file not in bpy.app.handlers.render_write:
+        bpy.app.handlers.render_write.append(_report_written_file)
+    
+    # Setup output directory
+    output_dir = STAGING_DIR or OUTPUT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Render presets or all cameras
+    if PRESETS:
+        render_presets(output_dir, PATTERN_NAME, shard)
+    else:
+        render_all_cameras(output_dir, shard)
+    
+    print("\n✓ SUCCESS!")
+    print(f"Renders saved to: {output_dir}")
 
 def main():
     """Main workflow."""
-    print("=" * __SCALE_PLACEHOLDER__)
+    print("=" * 50)
     print("RASHGUARD RENDER AUTOMATION")
-    print("=" * __SCALE_PLACEHOLDER__)
+    print("=" * 50)
     
     try:
-        # Load pattern image
-        pattern_image = load_pattern(PATTERN_NAME)
-        
-        # Assign to rashguard materials only
-        assign_pattern_to_rashguard_materials(pattern_image)
-        
-        # Apply thread color (already extracted in render_cli.py and passed via THREADS_COLOR)
-        apply_threads_color(THREADS_COLOR)
-        
-        # Setup output directory
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        output_dir = os.path.join(script_dir, "output")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Render presets or all cameras
-        if PRESETS:
-            render_presets(output_dir, PATTERN_NAME)
-        else:
-            render_all_cameras(output_dir)
-        
-        print("\n✓ SUCCESS!")
-        print(f"Renders saved to: {output_dir}")
-        
+        render_pattern(parse_shard(sys.argv))
     except Exception as e:
         print(f"\n✗ ERROR: {e}")
         sys.exit(1)
@@ -0,0 +1,40 @@
+"""
+Long-lived Blender render server for Rashguard mockup.
+Keeps Blender and the .blend loaded between patterns: reads one JSON job per line on stdin
+(same keys as RENDER_PARAMS) and answers JOB_DONE or JOB_FAILED on stdout after each one.
+"""
+
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import render_rashguard
+
+# Printed after every job, parsed by render_cli.py (keep in sync)
+JOB_DONE_MARKER = "JOB_DONE"
+JOB_FAILED_MARKER = "JOB_FAILED"
+
+def main():
+    """Render jobs from stdin until it is closed."""
+    print("=" * 50)
+    print("RASHGUARD RENDER SERVER")
+    print("=" * 50, flush=True)
+    
+    shard = render_rashguard.parse_shard(sys.argv)
+    
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        
+        try:
+            render_rashguard.apply_params(json.loads(line))
+            render_rashguard.render_pattern(shard)
+            print(JOB_DONE_MARKER, flush=True)
+        except Exception as e:
+            print(f"\n✗ ERROR: {e}")
+            print(JOB_FAILED_MARKER, flush=True)
+
+if __name__ == "__main__":
+    main()